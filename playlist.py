@@ -1,184 +1,651 @@
 import sys
+import asyncio
+import bisect
+import collections
+import functools
+import hashlib
+import json
+import logging
+import math
+import time
 from dotenv import load_dotenv
+import orjson
 import os
+import requests
 import spotipy
+import urllib3
 from spotipy.oauth2 import SpotifyOAuth
 
-def print_flush(*args, **kwargs):
-    print(*args, **kwargs)
-    sys.stdout.flush()
-
-# Load environment variables from .env file
-print_flush("Loading environment variables...")
-load_dotenv()
-
-# Retrieve Spotify API credentials from environment variables
-client_id = os.getenv('SPOTIPY_CLIENT_ID')
-client_secret = os.getenv('SPOTIPY_CLIENT_SECRET')
-redirect_uri = os.getenv('SPOTIPY_REDIRECT_URI')
-refresh_token = os.getenv('SPOTIPY_REFRESH_TOKEN')
-
-# Check if environment variables are loaded
-print_flush(f"Client ID: {'Loaded' if client_id else 'Missing'}")
-print_flush(f"Client Secret: {'Loaded' if client_secret else 'Missing'}")
-print_flush(f"Redirect URI: {'Loaded' if redirect_uri else 'Missing'}")
-print_flush(f"Refresh Token: {'Loaded' if refresh_token else 'Missing'}")
-
-# Set up authentication
-print_flush("Setting up Spotify OAuth...")
-try:
-    auth_manager = SpotifyOAuth(
-        client_id=client_id,
-        client_secret=client_secret,
-        redirect_uri=redirect_uri,
-        cache_path=".cache",
-        scope="user-top-read playlist-modify-private playlist-modify-public playlist-read-private"
+logger = logging.getLogger(__name__)
+
+# Maximum number of Spotify requests in flight at once across all playlist updates
+MAX_CONCURRENCY = 8
+
+def _decode_with_orjson(response, *args, **kwargs):
+    """
+    Response hook that makes response.json() decode the body with orjson.
+    """
+    response.json = lambda **kwargs: orjson.loads(response.content)
+    return response
+
+def _build_session():
+    """
+    Build the HTTP session shared by the OAuth manager and the Spotify client, so token
+    refreshes and API calls draw from one pool of keep-alive connections.
+    """
+    # Only network errors are retried at the transport level; 429 and 5xx responses
+    # are surfaced to SpotifyThrottle so Retry-After pauses every request, not one thread.
+    # Failed connections are always safe to retry, but a read error may follow a write
+    # that Spotify already applied, so only GETs are retried after one
+    session = requests.Session()
+    retry = urllib3.Retry(
+        total=3,
+        read=2,
+        allowed_methods=frozenset(['GET']),
+        status=0,
+        backoff_factor=0.3,
+        respect_retry_after_header=False
+    )
+    # Keep one pooled keep-alive connection per concurrent request so none are
+    # discarded and re-handshaken when every worker thread is busy
+    adapter = requests.adapters.HTTPAdapter(
+        pool_maxsize=MAX_CONCURRENCY,
+        pool_block=True,
+        max_retries=retry
     )
-    auth_manager.refresh_token = refresh_token
-    print_flush("Authentication manager initialized successfully.")
-except Exception as e:
-    print_flush(f"Error setting up Spotify OAuth: {e}")
-    sys.exit(1)
-
-# Initialize Spotify client
-print_flush("Initializing Spotify client...")
-try:
-    sp = spotipy.Spotify(auth_manager=auth_manager)
-    print_flush("Spotify client initialized.")
-except Exception as e:
-    print_flush(f"Error initializing Spotify client: {e}")
-    sys.exit(1)
-
-def get_top_tracks(limit, time_range):
-    """
-    Fetch top tracks from Spotify for a user.
-    """
-    print_flush(f"Fetching top {limit} tracks for time range: {time_range}")
-    tracks = []
-    offset = 0
-    while len(tracks) < limit:
+    session.mount('https://', adapter)
+    session.hooks['response'].append(_decode_with_orjson)
+    return session
+
+@functools.lru_cache(maxsize=None)
+def _client():
+    """
+    Build the Spotify client on first use, so importing this module does no auth work.
+    """
+    # Load environment variables from .env file
+    logger.info("Loading environment variables...")
+    load_dotenv()
+
+    # Retrieve Spotify API credentials from environment variables
+    client_id = os.getenv('SPOTIPY_CLIENT_ID')
+    client_secret = os.getenv('SPOTIPY_CLIENT_SECRET')
+    redirect_uri = os.getenv('SPOTIPY_REDIRECT_URI')
+    refresh_token = os.getenv('SPOTIPY_REFRESH_TOKEN')
+
+    # Check if environment variables are loaded
+    logger.info(f"Client ID: {'Loaded' if client_id else 'Missing'}")
+    logger.info(f"Client Secret: {'Loaded' if client_secret else 'Missing'}")
+    logger.info(f"Redirect URI: {'Loaded' if redirect_uri else 'Missing'}")
+    logger.info(f"Refresh Token: {'Loaded' if refresh_token else 'Missing'}")
+
+    session = _build_session()
+
+    # Set up authentication
+    logger.info("Setting up Spotify OAuth...")
+    try:
+        auth_manager = SpotifyOAuth(
+            client_id=client_id,
+            client_secret=client_secret,
+            redirect_uri=redirect_uri,
+            cache_path=".cache",
+            scope="user-top-read playlist-modify-private playlist-modify-public playlist-read-private",
+            requests_session=session
+        )
+        auth_manager.refresh_token = refresh_token
+        logger.info("Authentication manager initialized successfully.")
+    except Exception as e:
+        logger.error(f"Error setting up Spotify OAuth: {e}")
+        sys.exit(1)
+
+    # Initialize Spotify client
+    logger.info("Initializing Spotify client...")
+    try:
+        sp = spotipy.Spotify(auth_manager=auth_manager, requests_session=session)
+        logger.info("Spotify client initialized.")
+    except Exception as e:
+        logger.error(f"Error initializing Spotify client: {e}")
+        sys.exit(1)
+    return sp
+
+class SpotifyThrottle:
+    """
+    Shared gate for every Spotify request.
+
+    Spaces requests with a token bucket, pauses all callers while a 429 Retry-After
+    is honoured, and retries 429 responses, plus 5xx responses to reads, with capped
+    exponential backoff.
+    """
+
+    def __init__(self, rate=10, period=1.0, max_tries=6, backoff_base=1.0, backoff_cap=30.0, max_retry_after=120):
+        self.rate = rate
+        self.period = period
+        self.max_tries = max_tries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_retry_after = max_retry_after
+        self._tokens = rate
+        self._updated = None
+        self._bucket_lock = asyncio.Lock()
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENCY)
+        self._resume = asyncio.Event()
+        self._resume.set()
+
+    async def _acquire(self):
+        """
+        Take one token from the bucket, sleeping until one is available.
+        """
+        loop = asyncio.get_running_loop()
+        async with self._bucket_lock:
+            while True:
+                now = loop.time()
+                if self._updated is not None:
+                    elapsed = now - self._updated
+                    self._tokens = min(self.rate, self._tokens + elapsed * self.rate / self.period)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) * self.period / self.rate)
+
+    async def _pause(self, delay):
+        """
+        Stall every caller for the given delay; only the first caller to hit a 429 sleeps.
+        """
+        if not self._resume.is_set():
+            return
+        logger.warning(f"Rate limited by Spotify, pausing requests for {delay}s...")
+        self._resume.clear()
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._resume.set()
+
+    def _retry_after(self, error):
+        """
+        Return the Retry-After delay from a 429 response, or None if it is absent.
+        """
         try:
-            results = sp.current_user_top_tracks(limit=50, offset=offset, time_range=time_range)
-            tracks.extend(results['items'])
-            print_flush(f"Fetched {len(results['items'])} tracks (offset: {offset})")
-            if len(results['items']) < 50:
-                break
-            offset += 50
-        except Exception as e:
-            print_flush(f"Error fetching top tracks: {e}")
+            return int(error.headers['Retry-After'])
+        except (TypeError, KeyError, ValueError):
+            return None
+
+    async def call(self, fn, *args, retry_server_errors=False, **kwargs):
+        """
+        Run a blocking spotipy call in the default executor once the throttle allows it.
+
+        A 429 means the request was not applied, so it is always retried. A 5xx may come
+        back after a write was applied, so it is only retried with retry_server_errors,
+        which read-only calls pass.
+        """
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_tries):
+            await self._resume.wait()
+            await self._acquire()
+            try:
+                async with self._semaphore:
+                    return await loop.run_in_executor(None, functools.partial(fn, *args, **kwargs))
+            except spotipy.SpotifyException as e:
+                if e.http_status != 429 and (e.http_status < 500 or not retry_server_errors):
+                    raise
+                if attempt == self.max_tries - 1:
+                    raise
+                delay = self._retry_after(e) if e.http_status == 429 else None
+                if delay is not None:
+                    if delay > self.max_retry_after:
+                        raise
+                    await self._pause(delay)
+                else:
+                    await asyncio.sleep(min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+_throttle = None
+
+async def _call(fn, *args, **kwargs):
+    """
+    Run a spotipy call through the shared throttle.
+    """
+    return await _throttle.call(fn, *args, **kwargs)
+
+async def get_top_tracks(limit, time_range):
+    """
+    Fetch the URIs of a user's top tracks from Spotify.
+    The first page reports the total, then the remaining pages are fetched concurrently.
+    """
+    logger.info(f"Fetching top {limit} tracks for time range: {time_range}")
+
+    async def fetch_page(offset):
+        # This endpoint has no fields filter, so request no more tracks than needed
+        results = await _call(
+            _client().current_user_top_tracks,
+            limit=min(50, limit - offset),
+            offset=offset,
+            time_range=time_range,
+            retry_server_errors=True
+        )
+        logger.debug(f"Fetched {len(results['items'])} tracks (time range: {time_range}, offset: {offset})")
+        return results
+
+    try:
+        first_page = await fetch_page(0)
+    except Exception as e:
+        logger.error(f"Error fetching top tracks: {e}")
+        return []
+
+    # Only the URIs are used; drop the full track objects as soon as each page arrives
+    tracks = [track['uri'] for track in first_page['items']]
+    offsets = range(50, min(first_page['total'], limit), 50)
+    pages = await asyncio.gather(*(fetch_page(offset) for offset in offsets), return_exceptions=True)
+    for page in pages:
+        # Keep the tracks before a failed page so the ranking stays contiguous
+        if isinstance(page, BaseException):
+            logger.error(f"Error fetching top tracks: {page}")
             break
-    print_flush(f"Total tracks fetched: {len(tracks)}")
+        tracks.extend(track['uri'] for track in page['items'])
+    logger.info(f"Total tracks fetched for {time_range}: {len(tracks)}")
     return tracks[:limit]
 
-def get_or_create_playlist(name, is_private, description):
+# Playlist name -> {id, name, public, description}, shared by all playlist updates.
+# Deleting a playlist in Spotify only unfollows it and its ID can keep working, so a
+# stale entry is not reliably detectable from failed requests; the short TTL bounds
+# how long one is trusted
+PLAYLIST_CACHE_PATH = ".playlist_cache.json"
+PLAYLIST_CACHE_TTL = 60 * 60
+_playlists = {}
+_playlists_lock = None
+# Set once a listing has reached the last page, so names missing from the map are new
+_playlists_complete = False
+
+_user_id = None
+
+async def get_user_id():
+    """
+    Return the current user's ID, fetching it on first use; it never changes for a given token.
+    Callers hold _playlists_lock, so concurrent updates never fetch it twice.
+    """
+    global _user_id
+    if _user_id is None:
+        _user_id = (await _call(_client().me, retry_server_errors=True))['id']
+    return _user_id
+
+def _playlist_summary(playlist):
+    """
+    Keep only the playlist fields needed to find and update it.
+    """
+    return {key: playlist.get(key) for key in ('id', 'name', 'public', 'description')}
+
+def _load_playlist_cache():
+    """
+    Load the playlist map saved by a previous run if it is younger than PLAYLIST_CACHE_TTL.
+    """
+    try:
+        if time.time() - os.path.getmtime(PLAYLIST_CACHE_PATH) > PLAYLIST_CACHE_TTL:
+            return {}
+        with open(PLAYLIST_CACHE_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _save_playlist_cache():
+    """
+    Persist the playlist map so the next run can skip listing the user's playlists.
+    """
+    try:
+        with open(PLAYLIST_CACHE_PATH, 'w') as f:
+            json.dump(_playlists, f)
+    except OSError as e:
+        logger.warning(f"Could not save playlist cache: {e}")
+
+async def get_or_create_playlist(name, is_private, description, refresh=False):
     """
     Retrieve an existing playlist or create a new one if it doesn't exist.
+    Pass refresh=True to ignore the cached playlist map and list playlists again.
+    Returns the playlist and whether it was just created.
     """
-    print_flush(f"Looking for playlist '{name}'...")
+    global _playlists_complete
+    logger.info(f"Looking for playlist '{name}'...")
     try:
-        user_id = sp.me()['id']
-        playlists = sp.user_playlists(user_id)
-        for playlist in playlists['items']:
-            if playlist['name'] == name:
-                print_flush(f"Found playlist '{name}'. Updating if necessary...")
-                sp.user_playlist_change_details(
-                    user_id, 
+        async with _playlists_lock:
+            if refresh:
+                _playlists.clear()
+                _playlists_complete = False
+            if name not in _playlists and not _playlists_complete:
+                # Page through the user's playlists, stopping at the page with a match
+                playlists = await _call(_client().user_playlists, await get_user_id(), retry_server_errors=True)
+                while playlists:
+                    for playlist in playlists['items']:
+                        _playlists.setdefault(playlist['name'], _playlist_summary(playlist))
+                    if name in _playlists:
+                        break
+                    playlists = await _call(_client().next, playlists, retry_server_errors=True) if playlists['next'] else None
+                _playlists_complete = name not in _playlists
+                _save_playlist_cache()
+
+            playlist = _playlists.get(name)
+            if playlist is not None:
+                if playlist.get('public') == (not is_private) and playlist.get('description') == description:
+                    logger.info(f"Found playlist '{name}'. Details already up to date.")
+                    return playlist, False
+                logger.info(f"Found playlist '{name}'. Updating details...")
+                await _call(
+                    _client().user_playlist_change_details,
+                    await get_user_id(),
                     playlist['id'], 
                     public=not is_private,
                     description=description
                 )
-                return playlist
-        print_flush(f"Playlist '{name}' not found. Creating new playlist...")
-        return sp.user_playlist_create(user_id, name, public=not is_private, description=description)
+                playlist.update(public=not is_private, description=description)
+                _save_playlist_cache()
+                return playlist, False
+
+            logger.info(f"Playlist '{name}' not found. Creating new playlist...")
+            playlist = await _call(_client().user_playlist_create, await get_user_id(), name, public=not is_private, description=description)
+            _playlists[name] = _playlist_summary(playlist)
+            _save_playlist_cache()
+            return _playlists[name], True
     except Exception as e:
-        print_flush(f"Error getting or creating playlist: {e}")
-        sys.exit(1)
+        logger.error(f"Error getting or creating playlist: {e}")
+        raise
 
-def update_playlist(time_range, track_limit, is_private):
+# Spotify accepts at most this many URIs per playlist write request
+BATCH_SIZE = 100
+
+def _chunks(seq, n=BATCH_SIZE):
     """
-    Update a playlist with top tracks for a given time range, preserving existing tracks.
+    Split a list into consecutive slices of at most n items.
     """
-    print_flush(f"Updating playlist for time range: {time_range}")
-    
-    time_range_names = {
-        'short_term': 'Last 4 Weeks',
-        'medium_term': 'Last 6 Months',
-        'long_term': 'All Time'
-    }
-    playlist_name = f"Top {track_limit} Songs - {time_range_names[time_range]}"
-    playlist_description = f"This playlist contains my top {track_limit} tracks from {time_range_names[time_range].lower()}."
-
-    top_tracks = get_top_tracks(limit=track_limit, time_range=time_range)
-    if not top_tracks:
-        print_flush("No top tracks found, skipping playlist update.")
+    return [seq[i:i + n] for i in range(0, len(seq), n)]
+
+def _longest_increasing(seq):
+    """
+    Return one longest strictly increasing subsequence of seq.
+    """
+    tails = []
+    tail_indices = []
+    previous = [None] * len(seq)
+    for i, value in enumerate(seq):
+        j = bisect.bisect_left(tails, value)
+        if j:
+            previous[i] = tail_indices[j - 1]
+        if j == len(tails):
+            tails.append(value)
+            tail_indices.append(i)
+        else:
+            tails[j] = value
+            tail_indices[j] = i
+    result = []
+    i = tail_indices[-1] if tail_indices else None
+    while i is not None:
+        result.append(seq[i])
+        i = previous[i]
+    return result[::-1]
+
+def _plan_moves(current, target):
+    """
+    Plan single-track moves that turn current into target, a reordering of it.
+
+    Tracks on a longest common subsequence of the two lists stay put; every other
+    track is moved once, to just after its predecessor in target.
+    Returns (range_start, insert_before) pairs to apply in order.
+    """
+    position = {uri: i for i, uri in enumerate(target)}
+    anchored = {target[i] for i in _longest_increasing([position[uri] for uri in current])}
+    working = list(current)
+    moves = []
+    for i, uri in enumerate(target):
+        if uri in anchored:
+            continue
+        start = working.index(uri)
+        insert_before = working.index(target[i - 1]) + 1 if i else 0
+        if start == insert_before:
+            continue
+        moves.append((start, insert_before))
+        working.pop(start)
+        working.insert(insert_before if insert_before < start else insert_before - 1, uri)
+    return moves
+
+async def _fetch_all_playlist_uris(playlist_id):
+    """
+    Fetch the URIs of every track in a playlist, in playlist order.
+    """
+    async def fetch_page(offset):
+        return await _call(
+            _client().playlist_items,
+            playlist_id,
+            fields="items(track(uri)),total",
+            limit=100,
+            offset=offset,
+            retry_server_errors=True
+        )
+
+    first_page = await fetch_page(0)
+    pages = [first_page] + await asyncio.gather(*(fetch_page(offset) for offset in range(100, first_page['total'], 100)))
+    # Unavailable tracks come back with a null track object; keep them as None so list
+    # indices keep matching playlist positions
+    return [item['track']['uri'] if item['track'] else None for page in pages for item in page['items']]
+
+async def sync_playlist(playlist, current_tracks, desired_tracks):
+    """
+    Make the playlist contain desired_tracks in order, using whichever is fewer requests:
+    removing, adding and moving only the tracks that changed, or rewriting the playlist.
+    """
+    desired_set = set(desired_tracks)
+    duplicates = {uri for uri, count in collections.Counter(current_tracks).items() if count > 1}
+
+    # Duplicated tracks are removed outright and re-added once
+    to_remove = [uri for uri in dict.fromkeys(current_tracks) if uri not in desired_set or uri in duplicates]
+    removed = set(to_remove)
+    remaining = [uri for uri in current_tracks if uri not in removed]
+    remaining_set = set(remaining)
+    to_add = [uri for uri in desired_tracks if uri not in remaining_set]
+    moves = _plan_moves(remaining + to_add, desired_tracks)
+
+    diff_requests = math.ceil(len(to_remove) / BATCH_SIZE) + math.ceil(len(to_add) / BATCH_SIZE) + len(moves)
+    replace_requests = max(1, math.ceil(len(desired_tracks) / BATCH_SIZE))
+    # Unavailable tracks (None) cannot be removed by URI, so only a rewrite clears them
+    if diff_requests >= replace_requests or None in current_tracks:
+        logger.info(f"Rewriting playlist '{playlist['name']}' with {len(desired_tracks)} tracks...")
+        first_chunk, *other_chunks = _chunks(desired_tracks)
+        await _call(_client().playlist_replace_items, playlist['id'], first_chunk)
+        for chunk in other_chunks:
+            await _call(_client().playlist_add_items, playlist['id'], chunk)
         return
 
-    playlist = get_or_create_playlist(playlist_name, is_private, playlist_description)
+    if to_remove:
+        logger.info(f"Removing {len(to_remove)} tracks from playlist '{playlist['name']}'...")
+        # Removals are order-independent, so the chunks can be sent together
+        await asyncio.gather(*(
+            _call(_client().playlist_remove_all_occurrences_of_items, playlist['id'], chunk)
+            for chunk in _chunks(to_remove)
+        ))
+    if to_add:
+        logger.info(f"Adding {len(to_add)} tracks to playlist '{playlist['name']}'...")
+        # Spotify appends in arrival order, so added chunks are sent one at a time
+        for chunk in _chunks(to_add):
+            await _call(_client().playlist_add_items, playlist['id'], chunk)
+    if moves:
+        logger.info(f"Moving {len(moves)} tracks in playlist '{playlist['name']}'...")
+        for range_start, insert_before in moves:
+            await _call(_client().playlist_reorder_items, playlist['id'], range_start, insert_before)
+
+# Fingerprints of the top tracks each playlist was last synced with. A playlist whose
+# fingerprint is younger than its time range's TTL is not re-fetched at all. The
+# short_term and medium_term TTLs are shorter than the daily schedule, so they only
+# skip repeated manual runs; long_term sits just under six days, so the daily cron
+# re-fetches it about weekly even when a run starts a little early
+FINGERPRINT_DIR = ".fingerprints"
+FINGERPRINT_TTLS = {
+    'short_term': 60 * 60,
+    'medium_term': 12 * 60 * 60,
+    'long_term': 6 * 24 * 60 * 60
+}
+
+def _fingerprint(top_tracks, is_private, description):
+    """
+    Hash everything a playlist update depends on into a short fingerprint.
+    """
+    parts = [str(is_private), description] + top_tracks
+    return hashlib.sha1('\n'.join(parts).encode()).hexdigest()
+
+def _fingerprint_path(time_range, track_limit):
+    """
+    Return the file holding the fingerprint for one time range and track limit.
+    """
+    return os.path.join(FINGERPRINT_DIR, f"fingerprint_{time_range}_{track_limit}.txt")
+
+def _read_fingerprint(path):
+    """
+    Return a saved settings fingerprint, track fingerprint and age in seconds,
+    or (None, None, None) if there is none.
+    """
+    try:
+        with open(path) as f:
+            lines = f.read().split()
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return None, None, None
+    if len(lines) != 2:
+        return None, None, None
+    return lines[0], lines[1], age
+
+def _write_fingerprint(path, settings, fingerprint):
+    """
+    Save a settings fingerprint and track fingerprint, restarting the TTL.
+    """
+    try:
+        os.makedirs(FINGERPRINT_DIR, exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(f"{settings}\n{fingerprint}\n")
+    except OSError as e:
+        logger.warning(f"Could not save fingerprint: {e}")
+
+TIME_RANGE_NAMES = {
+    'short_term': 'Last 4 Weeks',
+    'medium_term': 'Last 6 Months',
+    'long_term': 'All Time'
+}
 
-    # Get current tracks in the playlist
-    current_tracks = []
-    results = sp.playlist_items(playlist['id'], fields="items(track(uri))")
-    current_tracks = [item['track']['uri'] for item in results['items']]
+@functools.lru_cache(maxsize=None)
+def _playlist_names(time_range, track_limit):
+    """
+    Return the playlist name and description for a time range and track limit.
+    """
+    range_name = TIME_RANGE_NAMES[time_range]
+    playlist_name = f"Top {track_limit} Songs - {range_name}"
+    playlist_description = f"This playlist contains my top {track_limit} tracks from {range_name.lower()}."
+    return playlist_name, playlist_description
+
+def _merge_tracks(top_tracks, current_tracks, track_limit):
+    """
+    Merge top tracks into the current playlist order.
 
-    # Create a set of current track URIs for faster lookup
+    Top tracks already in the playlist move to the front in ranking order, followed by
+    the remaining current tracks, trimmed to track_limit; top tracks not yet in the
+    playlist are returned separately to be appended after them.
+    """
+    current_tracks = [uri for uri in current_tracks if uri is not None]
     current_track_set = set(current_tracks)
+    kept_top_tracks = [uri for uri in top_tracks if uri in current_track_set]
+    tracks_to_add = [uri for uri in top_tracks if uri not in current_track_set]
+    new_track_list = list(dict.fromkeys(kept_top_tracks + current_tracks))[:track_limit]
+    return new_track_list, tracks_to_add
 
-    # Prepare the new track list
-    new_track_list = []
-    tracks_to_add = []
+async def update_playlist(time_range, track_limit, is_private):
+    """
+    Update a playlist with top tracks for a given time range, preserving existing tracks.
+    """
+    logger.info(f"Updating playlist for time range: {time_range}")
+    
+    playlist_name, playlist_description = _playlist_names(time_range, track_limit)
 
-    for track in top_tracks:
-        if track['uri'] in current_track_set:
-            new_track_list.append(track['uri'])
-        else:
-            tracks_to_add.append(track['uri'])
+    fingerprint_path = _fingerprint_path(time_range, track_limit)
+    settings = _fingerprint([], is_private, playlist_description)
+    saved_settings, saved_fingerprint, fingerprint_age = _read_fingerprint(fingerprint_path)
+    # A privacy or description change must reach Spotify even within the TTL
+    if saved_settings == settings and fingerprint_age < FINGERPRINT_TTLS[time_range]:
+        logger.info(f"Playlist '{playlist_name}' was synced {fingerprint_age / 60:.0f} minutes ago, skipping playlist update.")
+        return
+
+    top_tracks = await get_top_tracks(limit=track_limit, time_range=time_range)
+    if not top_tracks:
+        logger.info("No top tracks found, skipping playlist update.")
+        return
+
+    fingerprint = _fingerprint(top_tracks, is_private, playlist_description)
+    if fingerprint == saved_fingerprint:
+        logger.info(f"Top tracks for '{playlist_name}' are unchanged since the last sync, skipping playlist update.")
+        _write_fingerprint(fingerprint_path, settings, fingerprint)
+        return
 
-    # Add any remaining current tracks that are not in the top tracks
-    new_track_list.extend([uri for uri in current_tracks if uri not in new_track_list])
+    playlist, created = await get_or_create_playlist(playlist_name, is_private, playlist_description)
 
-    # Trim the list to the desired limit
-    new_track_list = new_track_list[:track_limit]
+    # Get current tracks in the playlist; one created just now is known to be empty
+    current_tracks = [] if created else await _fetch_all_playlist_uris(playlist['id'])
 
-    print_flush(f"Reordering tracks in playlist '{playlist_name}'...")
+    new_track_list, tracks_to_add = _merge_tracks(top_tracks, current_tracks, track_limit)
+    desired_tracks = new_track_list + tracks_to_add
+    if desired_tracks == current_tracks:
+        logger.info(f"Playlist '{playlist_name}' is already up to date.")
+        _write_fingerprint(fingerprint_path, settings, fingerprint)
+        return
+
+    logger.info(f"Syncing tracks in playlist '{playlist_name}'...")
     try:
-        sp.playlist_replace_items(playlist['id'], new_track_list)
+        await sync_playlist(playlist, current_tracks, desired_tracks)
     except Exception as e:
-        print_flush(f"Error reordering playlist: {e}")
-        sys.exit(1)
+        logger.error(f"Error syncing playlist: {e}")
+        raise
 
-    if tracks_to_add:
-        print_flush(f"Adding {len(tracks_to_add)} new tracks to playlist '{playlist_name}'...")
-        try:
-            sp.playlist_add_items(playlist['id'], tracks_to_add)
-        except Exception as e:
-            print_flush(f"Error adding new tracks to playlist: {e}")
-            sys.exit(1)
+    # New top tracks are appended first and only reach their ranked position on the next
+    # run, so only record the fingerprint once another run would leave the playlist as is
+    settled_list, settled_additions = _merge_tracks(top_tracks, desired_tracks, track_limit)
+    if settled_list + settled_additions == desired_tracks:
+        _write_fingerprint(fingerprint_path, settings, fingerprint)
 
-    print_flush('-' * 30)
-    print_flush(f"Playlist '{playlist_name}' updated successfully!")
-    print_flush(f"Total tracks: {len(new_track_list)}")
-    print_flush(f"New tracks added: {len(tracks_to_add)}")
-    print_flush(f"Playlist privacy: {'Private' if is_private else 'Public'}")
-    print_flush('-' * 30)
+    logger.info('-' * 30)
+    logger.info(f"Playlist '{playlist_name}' updated successfully!")
+    logger.info(f"Total tracks: {len(new_track_list)}")
+    logger.info(f"New tracks added: {len(tracks_to_add)}")
+    logger.info(f"Playlist privacy: {'Private' if is_private else 'Public'}")
+    logger.info('-' * 30)
 
-def main():
+async def main():
     """
-    Main function to update playlists for different time ranges.
+    Main function to update playlists for different time ranges concurrently.
     """
-    print_flush("Starting playlist update process...")
+    global _throttle, _playlists_lock
+    logger.info("Starting playlist update process...")
+    sp = _client()
+    # Refresh the token once here rather than in every concurrent first request
+    await asyncio.get_running_loop().run_in_executor(
+        None, functools.partial(sp.auth_manager.get_access_token, as_dict=False)
+    )
+    _throttle = SpotifyThrottle()
+    _playlists_lock = asyncio.Lock()
+    _playlists.update(_load_playlist_cache())
 
     track_limit = 100
     is_playlist_private = False
 
     time_ranges = ['short_term', 'medium_term', 'long_term']
-    for time_range in time_ranges:
+    # Let every update finish even if another one fails
+    results = await asyncio.gather(*(
         update_playlist(time_range, track_limit, is_playlist_private)
+        for time_range in time_ranges
+    ), return_exceptions=True)
+
+    failed = False
+    for time_range, result in zip(time_ranges, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error updating playlist for time range {time_range}: {result}")
+            failed = True
+    if failed:
+        sys.exit(1)
 
-    print_flush("Playlist update process completed.")
+    logger.info("Playlist update process completed.")
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, stream=sys.stdout, format='%(message)s')
     try:
-        main()
+        asyncio.run(main())
     except Exception as e:
-        print_flush(f"An unexpected error occurred: {e}")
+        logger.error(f"An unexpected error occurred: {e}")
         sys.exit(1)
\ No newline at end of file